@@ -3,11 +3,16 @@ SoF Event Extractor Backend API
 FastAPI application for processing maritime Statement of Facts documents with authentication
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Depends, Form, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Depends, Form, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
+import orjson
 import uvicorn
+import aiofiles
+import asyncio
+import csv
+import io
 import os
 import uuid
 import json
@@ -16,24 +21,26 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import pandas as pd
 from pathlib import Path
+from cachetools import TTLCache
+from concurrent.futures import ProcessPoolExecutor
 
-# Import our new integrated modules
-try:
-    from utils.sof_pipeline import (
-        process_uploaded_files, 
-        extract_events_and_summary,
-        calculate_laytime,
-        process_clicked_pdf_enhanced,
-        LaytimeResult as SofLaytimeResult
-    )
-    print("✅ SoF Pipeline modules imported successfully")
-except ImportError as e:
-    print(f"⚠️ Warning: SoF Pipeline modules failed to import: {e}")
-    process_uploaded_files = None
-    extract_events_and_summary = None
-    calculate_laytime = None
-    process_clicked_pdf_enhanced = None
-    SofLaytimeResult = None
+# The SoF pipeline drags in the whole OCR/AI stack (PyMuPDF, PIL,
+# pytesseract, google-generativeai), so import it on first use instead of
+# at worker boot - this keeps cold start fast under multi-worker launches
+_sof_pipeline = None
+
+def get_sof_pipeline():
+    """Lazily import the integrated SoF pipeline module"""
+    global _sof_pipeline
+    if _sof_pipeline is None:
+        try:
+            from utils import sof_pipeline
+            _sof_pipeline = sof_pipeline
+            print("✅ SoF Pipeline modules imported successfully")
+        except ImportError as e:
+            print(f"⚠️ Warning: SoF Pipeline modules failed to import: {e}")
+            raise
+    return _sof_pipeline
 
 # Import authentication modules
 from utils.auth import (
@@ -45,6 +52,7 @@ from utils.user_models import (
     User, UserCreate, UserLogin, UserResponse, Token,
     user_db
 )
+from utils.job_store import job_store
 from models.sof_models import (
     UploadRequest, EventData, VoyageSummary, LaytimeCalculation,
     LaytimeResult, ProcessingResult, JobStatus as JobStatusModel
@@ -54,6 +62,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Gemini API key, resolved once at import time rather than per job
+GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY", "")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -62,7 +73,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="SoF Event Extractor API with Authentication",
     description="AI-powered maritime document processing for Statement of Facts with user authentication",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS for frontend integration
@@ -80,11 +92,43 @@ RESULTS_DIR = Path("results")
 UPLOAD_DIR.mkdir(exist_ok=True)
 RESULTS_DIR.mkdir(exist_ok=True)
 
+# Upload limits
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB limit
+UPLOAD_CHUNK_SIZE = 1 << 20  # stream uploads to disk in 1 MiB chunks
+
+# Accepted upload types (built once, not per request)
+ALLOWED_EXTENSIONS = frozenset({'.pdf', '.docx', '.doc', '.txt', '.png', '.jpg', '.jpeg', '.tiff', '.bmp', '.webp'})
+ALLOWED_SUFFIXES = tuple(ALLOWED_EXTENSIONS)
+
+# Event payload schema (mirrors EventData) - the columns the laytime
+# pipeline reads, guaranteed to exist on the calculate payload even when
+# a client omits them
+EVENT_COLUMNS = (
+    "event", "start_time_iso", "end_time_iso", "date", "duration",
+    "laytime", "laytime_counts", "raw_line", "filename"
+)
+
+# Process pool for the CPU-bound parsing/OCR pipeline - separate
+# interpreters sidestep the GIL so extraction can't starve request
+# handling in this worker
+_process_pool = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared pipeline process pool"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _process_pool
+
 # No longer need these old processors - using integrated SoF pipeline
 print("🚀 Using integrated SoF Pipeline for document processing")
 
-# In-memory job storage (use database in production)
-jobs = {}
+@app.on_event("startup")
+async def check_gemini_key():
+    """Warn once at startup if Gemini extraction is unavailable"""
+    app.state.has_gemini = bool(GEMINI_API_KEY)
+    if not app.state.has_gemini:
+        logger.warning("⚠️ No Google API key found, processing will be limited")
 
 class JobStatus:
     PROCESSING = "processing"
@@ -115,12 +159,17 @@ async def register(user_create: UserCreate):
                 detail="Password must be at least 8 characters long and contain uppercase, lowercase, and numeric characters"
             )
         
-        # Hash password
-        hashed_password = get_password_hash(user_create.password)
+        # Hash password off the event loop - bcrypt is deliberately slow
+        hashed_password = await asyncio.get_running_loop().run_in_executor(
+            None, get_password_hash, user_create.password
+        )
         
         # Create user
         user = user_db.create_user(user_create, hashed_password)
-        
+
+        # New user must show up in listings immediately
+        _user_list_cache.clear()
+
         # Return user response (without password)
         return UserResponse(
             id=user.id,
@@ -149,8 +198,12 @@ async def login(user_login: UserLogin):
                 detail="Incorrect username or password"
             )
         
-        # Verify password
-        if not verify_password(user_login.password, user.hashed_password):
+        # Verify password off the event loop so concurrent logins don't
+        # serialise on the ~100ms bcrypt check
+        password_ok = await asyncio.get_running_loop().run_in_executor(
+            None, verify_password, user_login.password, user.hashed_password
+        )
+        if not password_ok:
             raise HTTPException(
                 status_code=401,
                 detail="Incorrect username or password"
@@ -163,23 +216,20 @@ async def login(user_login: UserLogin):
             expires_delta=access_token_expires
         )
         
-        # Update last login
-        user_db.update_last_login(user.username)
-        
-        # Get updated user info
-        updated_user = user_db.get_user_by_username(user.username)
-        
+        # Update last login on the already-loaded user - no second DB read
+        user.last_login = user_db.update_last_login(user.username)
+
         return Token(
             access_token=access_token,
             token_type="bearer",
             user=UserResponse(
-                id=updated_user.id,
-                username=updated_user.username,
-                email=updated_user.email,
-                full_name=updated_user.full_name,
-                is_active=updated_user.is_active,
-                created_at=updated_user.created_at,
-                last_login=updated_user.last_login
+                id=user.id,
+                username=user.username,
+                email=user.email,
+                full_name=user.full_name,
+                is_active=user.is_active,
+                created_at=user.created_at,
+                last_login=user.last_login
             )
         )
         
@@ -205,11 +255,23 @@ async def get_current_user_info(current_user: str = Depends(get_current_user)):
         last_login=user.last_login
     )
 
+# Short-TTL cache of paginated user listings, cleared whenever a user registers
+_user_list_cache = TTLCache(maxsize=64, ttl=5)
+
 @app.get("/api/auth/users", response_model=List[UserResponse])
-async def list_users(current_user: str = Depends(get_current_user)):
-    """List all users (admin endpoint)"""
+async def list_users(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    current_user: str = Depends(get_current_user)
+):
+    """List users with pagination (admin endpoint)"""
     # In production, add admin role check here
-    return user_db.get_all_users()
+    cache_key = (limit, offset)
+    users = _user_list_cache.get(cache_key)
+    if users is None:
+        users = user_db.get_all_users()[offset:offset + limit]
+        _user_list_cache[cache_key] = users
+    return users
 
 # Job status enumeration 
 class JobStatus:
@@ -218,17 +280,19 @@ class JobStatus:
     COMPLETED = "completed"
     FAILED = "failed"
 
-# Create a simple file-like object from upload
-class FileUpload:
-    def __init__(self, content: bytes, name: str):
-        self.content = content
-        self.name = name
-        
-    def read(self):
-        return self.content
-    
-    def getvalue(self):
-        return self.content
+def _norm_cell(value):
+    """Normalize one event cell to a JSON-safe value
+
+    Plain type checks instead of pd.isna so normalization doesn't pay a
+    numpy dispatch per cell; NaN/NaT both fail the self-equality test.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return None if value != value else str(value)
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return None if value != value else value.isoformat()
+    return str(value)
 
 async def process_document_with_sof_pipeline(job_id: str, file_path: Path, filename: str, use_enhanced_processing: bool = False):
     """
@@ -236,19 +300,18 @@ async def process_document_with_sof_pipeline(job_id: str, file_path: Path, filen
     """
     try:
         logger.info(f"🚀 Processing document {filename} with SoF Pipeline (enhanced: {use_enhanced_processing})")
-        
-        # Get API key for Gemini
-        gemini_api_key = os.getenv("GOOGLE_API_KEY", "")
-        if not gemini_api_key:
-            logger.warning("⚠️ No Google API key found, processing will be limited")
-        
-        # Read file content
-        with open(file_path, 'rb') as f:
-            file_content = f.read()
-        
-        # Create file upload object
-        file_upload = FileUpload(file_content, filename)
-        
+
+        # Parsing/OCR is CPU-bound; run it in the process pool so the event
+        # loop (and the GIL) stay free for status polls and other requests.
+        # Only the file path crosses into the worker - the worker reads the
+        # bytes itself, so the parent never materialises them
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        pipeline = get_sof_pipeline()
+
+        # Create path-backed file upload object
+        file_upload = pipeline.PathUpload(str(file_path), filename)
+
         # Determine file type and process accordingly
         file_extension = filename.lower().split('.')[-1]
         
@@ -256,24 +319,28 @@ async def process_document_with_sof_pipeline(job_id: str, file_path: Path, filen
             # Use specialized clicked PDF processing
             logger.info("🎯 Using enhanced clicked PDF processing")
             
-            if not gemini_api_key:
+            if not GEMINI_API_KEY:
                 raise Exception("Enhanced processing requires Google API key")
             
-            events_df, summary_data = process_clicked_pdf_enhanced(file_content, filename, gemini_api_key)
-            
+            events_df, summary_data = await loop.run_in_executor(
+                pool, pipeline.process_clicked_pdf_from_path, str(file_path), filename, GEMINI_API_KEY
+            )
+
         else:
             # Use standard SoF pipeline processing
             logger.info("📄 Using standard SoF pipeline processing")
             
             # Process uploaded files
-            docs = process_uploaded_files([file_upload])
-            
+            docs = await loop.run_in_executor(pool, pipeline.process_uploaded_files, [file_upload])
+
             if not docs:
                 raise Exception("No text could be extracted from the document")
             
             # Extract events and summary
-            if gemini_api_key:
-                events_df, summary_data = extract_events_and_summary(docs, gemini_api_key)
+            if GEMINI_API_KEY:
+                events_df, summary_data = await loop.run_in_executor(
+                    pool, pipeline.extract_events_and_summary, docs, GEMINI_API_KEY
+                )
             else:
                 # Fallback without Gemini
                 logger.warning("⚠️ No Gemini API key - using text extraction only")
@@ -282,16 +349,11 @@ async def process_document_with_sof_pipeline(job_id: str, file_path: Path, filen
         
         # Convert DataFrame to list of dictionaries for JSON serialization
         if not events_df.empty:
-            events_list = events_df.to_dict('records')
             # Convert any Timestamp objects to strings
-            for event in events_list:
-                for key, value in event.items():
-                    if pd.isna(value):
-                        event[key] = None
-                    elif hasattr(value, 'isoformat'):
-                        event[key] = value.isoformat()
-                    else:
-                        event[key] = str(value) if value is not None else None
+            events_list = [
+                {key: _norm_cell(value) for key, value in record.items()}
+                for record in events_df.to_dict('records')
+            ]
         else:
             events_list = []
             logger.warning("No events extracted from document")
@@ -303,12 +365,14 @@ async def process_document_with_sof_pipeline(job_id: str, file_path: Path, filen
             "has_laytime_data": len(events_list) > 0 and any(event.get('laytime_counts') for event in events_list)
         }
         
+        # Serialize once to a single blob and write it whole - one
+        # executor hop instead of aiofiles' separate open/write/close trips
         result_file = RESULTS_DIR / f"{job_id}_results.json"
-        with open(result_file, 'w') as f:
-            json.dump(result_data, f, indent=2, default=str)
+        payload = orjson.dumps(result_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str)
+        await loop.run_in_executor(None, result_file.write_bytes, payload)
         
         # Update job status
-        jobs[job_id].update({
+        job_store.update_job(job_id, {
             "status": JobStatus.COMPLETED,
             "events": events_list,
             "summary": summary_data,
@@ -321,7 +385,7 @@ async def process_document_with_sof_pipeline(job_id: str, file_path: Path, filen
         
     except Exception as e:
         logger.error(f"💥 Document processing failed for {filename}: {e}")
-        jobs[job_id].update({
+        job_store.update_job(job_id, {
             "status": JobStatus.FAILED,
             "error": str(e),
             "failed_at": datetime.now().isoformat()
@@ -329,6 +393,7 @@ async def process_document_with_sof_pipeline(job_id: str, file_path: Path, filen
 
 @app.post("/api/upload")
 async def upload_document(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     use_enhanced_processing: bool = False,
@@ -338,30 +403,42 @@ async def upload_document(
     Upload and process a maritime document using the integrated SoF pipeline
     """
     try:
+        # Reject oversize uploads from the Content-Length header before the
+        # body is even read; the streamed write below still enforces the
+        # exact limit for chunked requests that omit the header
+        content_length = request.headers.get('content-length', '0')
+        if content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE + UPLOAD_CHUNK_SIZE:
+            raise HTTPException(status_code=413, detail="File size exceeds 10MB limit")
+
         # Validate file type
-        allowed_extensions = {'.pdf', '.docx', '.doc', '.txt', '.png', '.jpg', '.jpeg', '.tiff', '.bmp', '.webp'}
-        file_extension = '.' + file.filename.lower().split('.')[-1]
-        
-        if file_extension not in allowed_extensions:
+        filename_lower = file.filename.lower()
+        if not filename_lower.endswith(ALLOWED_SUFFIXES):
+            file_extension = '.' + filename_lower.rsplit('.', 1)[-1]
             raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file type: {file_extension}. Supported types: {', '.join(allowed_extensions)}"
+                status_code=400,
+                detail=f"Unsupported file type: {file_extension}. Supported types: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
             )
         
-        # Validate file size (10MB limit)
-        content = await file.read()
-        if len(content) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
-        
-        # Save uploaded file
+        # Save uploaded file, streaming to disk in chunks so peak memory
+        # stays O(chunk) instead of O(filesize)
         job_id = str(uuid.uuid4())
         file_path = UPLOAD_DIR / f"{job_id}_{file.filename}"
-        
-        with open(file_path, 'wb') as f:
-            f.write(content)
+
+        bytes_written = 0
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    bytes_written += len(chunk)
+                    if bytes_written > MAX_UPLOAD_SIZE:
+                        # Validate file size (10MB limit) while streaming
+                        raise HTTPException(status_code=413, detail="File size exceeds 10MB limit")
+                    await f.write(chunk)
+        except HTTPException:
+            file_path.unlink(missing_ok=True)
+            raise
         
         # Create job entry
-        jobs[job_id] = {
+        job_store.set_job(job_id, {
             "job_id": job_id,
             "status": JobStatus.PROCESSING,
             "user": current_user,
@@ -369,8 +446,8 @@ async def upload_document(
             "file_path": str(file_path),
             "use_enhanced_processing": use_enhanced_processing,
             "created_at": datetime.now().isoformat()
-        }
-        
+        })
+
         # Start background processing
         background_tasks.add_task(
             process_document_with_sof_pipeline, 
@@ -404,14 +481,20 @@ async def calculate_laytime_endpoint(
     Calculate laytime based on voyage summary and events data
     """
     try:
-        # Convert events data to DataFrame format expected by the pipeline
-        events_df = pd.DataFrame(laytime_data.events)
+        # Convert events data to DataFrame format expected by the pipeline.
+        # Keep whatever keys the client sent (e.g. the capitalized display
+        # fields from /api/result) and only add the columns the calculator
+        # reads when the payload omits them
+        events_df = pd.DataFrame.from_records(laytime_data.events)
+        missing = [col for col in EVENT_COLUMNS if col not in events_df.columns]
+        if missing:
+            events_df = events_df.reindex(columns=[*events_df.columns, *missing])
         
         if events_df.empty:
             raise HTTPException(status_code=400, detail="No events provided for calculation")
         
         # Perform laytime calculation using the SoF pipeline
-        laytime_result = calculate_laytime(laytime_data.summary, events_df)
+        laytime_result = get_sof_pipeline().calculate_laytime(laytime_data.summary, events_df)
         
         # Convert result to API response format
         result = {
@@ -421,7 +504,7 @@ async def calculate_laytime_endpoint(
             "demurrage_due": laytime_result.demurrage_due,
             "dispatch_due": laytime_result.dispatch_due,
             "calculation_log": laytime_result.calculation_log,
-            "events_with_calculations": laytime_result.events_df.to_dict('records') if not laytime_result.events_df.empty else []
+            "events_with_calculations": laytime_result.events_records
         }
         
         logger.info(f"💰 Laytime calculated: allowed={laytime_result.laytime_allowed_days:.4f}, consumed={laytime_result.laytime_consumed_days:.4f}")
@@ -437,11 +520,10 @@ async def get_result(job_id: str, current_user: str = Depends(get_current_user))
     """
     Get processing results for a specific job (user can only access their own jobs)
     """
-    if job_id not in jobs:
+    job = job_store.get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
-    
     # Check if user owns this job
     if job.get("user") != current_user:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -474,11 +556,10 @@ async def get_status(job_id: str, current_user: str = Depends(get_current_user))
     """
     Get processing status for a specific job (user can only access their own jobs)
     """
-    if job_id not in jobs:
+    job = job_store.get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
-    
     # Check if user owns this job
     if job.get("user") != current_user:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -499,11 +580,10 @@ async def export_data(
     """
     Export processed events as CSV or JSON
     """
-    if job_id not in jobs:
+    job = job_store.get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
-    
     # Check if user owns this job
     if job.get("user") != current_user:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -514,34 +594,25 @@ async def export_data(
     events = job["events"]
     if not events:
         raise HTTPException(status_code=404, detail="No events found")
-    
-    # Additional debugging to understand the exact structure
-    logger.info(f"🔍 DETAILED DEBUG - Raw events data:")
-    logger.info(f"🔍 Type: {type(events)}")
-    logger.info(f"🔍 Length: {len(events) if events else 0}")
-    if events and len(events) > 0:
-        logger.info(f"🔍 First element type: {type(events[0])}")
-        logger.info(f"🔍 First element: {events[0]}")
-        if isinstance(events[0], dict):
-            logger.info(f"🔍 First element keys: {list(events[0].keys())}")
-        elif isinstance(events[0], str):
-            logger.info(f"🔍 First element is STRING - this is the problem!")
-            logger.info(f"🔍 String content: {events[0][:200]}...")
+
+    # Structure dump is only worth materialising when someone is
+    # actually debugging - the f-strings are skipped entirely otherwise
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"🔍 Exporting {len(events)} events, first: {str(events[0])[:200]}")
 
     try:
-        # Debug: Print the structure of events data
-        logger.info(f"🔍 Debug - Events type: {type(events)}")
-        logger.info(f"🔍 Debug - Events length: {len(events) if events else 0}")
-        if events and len(events) > 0:
-            logger.info(f"🔍 Debug - First event type: {type(events[0])}")
-            logger.info(f"🔍 Debug - First event keys: {list(events[0].keys()) if isinstance(events[0], dict) else 'Not a dict'}")
-            logger.info(f"🔍 Debug - First event sample: {str(events[0])[:200]}...")
-        
         if export_format.lower() == "csv":
-            # Convert to DataFrame and export as CSV
-            df = pd.DataFrame(events)
+            # Write CSV directly from the list of dicts - no DataFrame needed
+            # for a handful of rows
+            fieldnames = list(dict.fromkeys(key for event in events for key in event))
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(events)
+
             csv_file = RESULTS_DIR / f"{job_id}_export.csv"
-            df.to_csv(csv_file, index=False)
+            async with aiofiles.open(csv_file, 'w', newline='') as f:
+                await f.write(buffer.getvalue())
             
             return FileResponse(
                 csv_file,
@@ -550,57 +621,12 @@ async def export_data(
             )
         
         elif export_format.lower() == "json":
-            # Export as JSON with proper datetime handling
-            import json
-            
-            class DateTimeEncoder(json.JSONEncoder):
-                def default(self, obj):
-                    if pd.isna(obj):
-                        return None
-                    if hasattr(obj, 'isoformat'):
-                        return obj.isoformat()
-                    return super().default(obj)
-            
-            # Clean the events data for JSON export
-            logger.info(f"📄 Creating JSON export for {len(events)} events")
-            logger.info(f"🔍 Debug - Events type: {type(events)}")
-            
-            if events and len(events) > 0:
-                logger.info(f"🔍 Debug - First event type: {type(events[0])}")
-                logger.info(f"🔍 Debug - First event sample: {str(events[0])[:200]}...")
-            
-            clean_events = []
-            for event in events:
-                clean_event = {}
-                for key, value in event.items():
-                    if pd.isna(value) or value is None or value == '':
-                        clean_event[key] = None
-                    elif isinstance(value, pd.Timestamp):
-                        clean_event[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                    elif isinstance(value, datetime):
-                        clean_event[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                    elif hasattr(value, 'isoformat'):
-                        clean_event[key] = value.isoformat()
-                    else:
-                        clean_event[key] = str(value)
-                clean_events.append(clean_event)
-            
-            logger.info(f"🔍 Debug - Clean events length: {len(clean_events)}")
-            if clean_events:
-                logger.info(f"🔍 Debug - First clean event: {str(clean_events[0])[:300]}...")
-            
+            # orjson handles datetimes natively and serialises NaN as null,
+            # so the events list is written as-is - no per-field cleaning pass
             json_file = RESULTS_DIR / f"{job_id}_export.json"
-            logger.info(f"🔍 Debug - Writing to file: {json_file}")
-            
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(clean_events, f, indent=2, cls=DateTimeEncoder, ensure_ascii=False)
-            
-            # Debug: Verify file content
-            logger.info(f"🔍 Debug - File size: {json_file.stat().st_size} bytes")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                file_content = f.read(500)
-                logger.info(f"🔍 Debug - File content start: {file_content}")
-            
+            async with aiofiles.open(json_file, 'wb') as f:
+                await f.write(orjson.dumps(events, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str))
+
             return FileResponse(
                 json_file,
                 media_type='application/json',
@@ -618,17 +644,18 @@ async def list_jobs(current_user: str = Depends(get_current_user)):
     """
     List all processing jobs for the current user
     """
-    user_jobs = []
-    for job_id, job in jobs.items():
-        if job.get("user") == current_user:
-            user_jobs.append({
-                "job_id": job_id,
-                "status": job["status"],
-                "filename": job["filename"],
-                "created_at": job["created_at"]
-            })
-    
-    return {"jobs": user_jobs}
+    return {"jobs": job_store.list_job_summaries_for_user(current_user)}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # Convenience launcher only. Production runs behind gunicorn, which
+    # supervises the workers: `gunicorn -c gunicorn_conf.py app:app`.
+    # Use `uvicorn app:app --reload` directly for development.
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 4))),
+        loop="uvloop",
+        http="httptools",
+        reload=False
+    )
@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for production deployments
+
+Run with:
+    gunicorn -c gunicorn_conf.py app:app
+
+Gunicorn supervises the worker processes (restarts on crash, graceful
+reloads) while each worker runs the app on its own uvicorn event loop.
+Job state lives in SQLite, so workers share it.
+"""
+
+import os
+
+from uvicorn.workers import UvicornWorker
+
+bind = "0.0.0.0:8000"
+
+# 2*CPU+1 workers: enough to keep every core busy while one worker sits
+# in a blocking call. Override with WEB_CONCURRENCY for constrained hosts.
+workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+
+worker_class = "gunicorn_conf.SoFUvicornWorker"
+keepalive = 5
+timeout = 120
+
+# Recycle workers periodically so a slow leak in the OCR/AI stack can't
+# accumulate; the jitter staggers restarts across workers.
+max_requests = 1000
+max_requests_jitter = 100
+
+
+class SoFUvicornWorker(UvicornWorker):
+    """UvicornWorker pinned to uvloop + httptools"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
@@ -8,6 +8,10 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TTLCache
+import hashlib
+import re
+import threading
 import os
 from dotenv import load_dotenv
 
@@ -18,6 +22,22 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Short-TTL cache of verified tokens so hot tokens skip the repeated
+# jwt.decode + signature verification on every authenticated request.
+# Keyed by a token hash so raw tokens are never stored in memory.
+TOKEN_CACHE_TTL_SECONDS = 30
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
+def _token_cache_key(token: str) -> str:
+    """Derive the cache key for a raw JWT (sha256 prefix, never the token itself)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+def invalidate_token(token_hash: str):
+    """Remove a cached token verification result (e.g. on logout)"""
+    with _token_cache_lock:
+        _token_cache.pop(token_hash, None)
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -65,10 +85,23 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     
     try:
         token = credentials.credentials
+        cache_key = _token_cache_key(token)
+
+        # Serve hot tokens from the cache, skipping the crypto entirely
+        with _token_cache_lock:
+            username = _token_cache.get(cache_key)
+        if username is not None:
+            return username
+
         username = verify_token(token)
         if username is None:
             raise credentials_exception
+
+        with _token_cache_lock:
+            _token_cache[cache_key] = username
         return username
+    except HTTPException:
+        raise
     except Exception:
         raise credentials_exception
 
@@ -81,15 +114,23 @@ def validate_password_strength(password: str) -> bool:
     """Validate password meets minimum requirements"""
     if len(password) < 8:
         return False
-    
-    has_upper = any(c.isupper() for c in password)
-    has_lower = any(c.islower() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    
-    return has_upper and has_lower and has_digit
+
+    # Single pass over the password instead of one scan per character class
+    has_upper = has_lower = has_digit = False
+    for c in password:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        if has_upper and has_lower and has_digit:
+            return True
+    return False
+
+# Compiled once - register hits this on every request
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 def validate_email(email: str) -> bool:
     """Basic email validation"""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
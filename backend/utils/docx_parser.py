@@ -4,11 +4,17 @@ Handles DOCX text extraction using python-docx
 """
 
 from docx import Document
+from io import BytesIO
+from lxml import etree
 from pathlib import Path
 import logging
+import zipfile
 
 logger = logging.getLogger(__name__)
 
+# WordprocessingML namespace used inside word/document.xml
+WORDML_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
 class DocxParser:
     """DOCX text extraction utility"""
     
@@ -26,30 +32,62 @@ class DocxParser:
             str: Extracted text content
         """
         try:
-            doc = Document(file_path)
-            text = ""
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
-            
-            if not text.strip():
+            try:
+                text = self._extract_text_streaming(file_path)
+            except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError):
+                # Malformed zip or document.xml - let python-docx have a go
+                logger.warning(f"Streaming parse failed for {file_path}, falling back to python-docx")
+                text = self._extract_text_python_docx(file_path)
+
+            if not text:
                 logger.warning(f"No text extracted from DOCX: {file_path}")
                 return ""
-            
+
             logger.info(f"Successfully extracted {len(text)} characters from DOCX")
-            return text.strip()
-            
+            return text
+
         except Exception as e:
             logger.error(f"Error extracting text from DOCX {file_path}: {e}")
             raise Exception(f"Failed to extract text from DOCX: {str(e)}")
+
+    def _extract_text_streaming(self, file_path: Path) -> str:
+        """
+        Extract text by streaming word/document.xml with lxml iterparse
+
+        Reads w:t runs straight out of the XML instead of building
+        python-docx's full object model, clearing each parsed element so
+        memory stays flat regardless of document size. Paragraph ends
+        become newlines, which also covers text inside table cells.
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            xml = archive.read("word/document.xml")
+
+        parts = []
+        for _, elem in etree.iterparse(
+            BytesIO(xml), tag=(f"{WORDML_NS}t", f"{WORDML_NS}p")
+        ):
+            if elem.tag.endswith("}t"):
+                parts.append(elem.text or "")
+            else:
+                parts.append("\n")
+            elem.clear()
+        return "".join(parts).strip()
+
+    def _extract_text_python_docx(self, file_path: Path) -> str:
+        """Extract text via the python-docx object model (fallback path)"""
+        doc = Document(file_path)
+
+        # Collect pieces and join once - repeated `text +=` is O(N^2)
+        # on large documents. doc.paragraphs/doc.tables re-walk the
+        # XML on every access, so read each exactly once.
+        parts = [paragraph.text for paragraph in doc.paragraphs]
+
+        # Extract text from tables
+        for table in doc.tables:
+            for row in table.rows:
+                parts.append(" ".join(cell.text for cell in row.cells))
+
+        return "\n".join(parts).strip()
     
     def is_supported(self, file_path: Path) -> bool:
         """Check if file extension is supported"""
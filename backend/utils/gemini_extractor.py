@@ -3,9 +3,10 @@ Gemini Extractor Module for SoF Event Extractor
 Handles event extraction using Google's Gemini AI
 """
 
-import google.generativeai as genai
 import os
 import json
+
+import orjson
 import logging
 from typing import List, Dict, Any
 from dotenv import load_dotenv
@@ -16,6 +17,9 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Compiled once - response parsing runs per extraction call
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
 class GeminiEmbeddingExtractor:
     """Gemini-based maritime event extraction utility"""
     
@@ -28,6 +32,10 @@ class GeminiEmbeddingExtractor:
             self.model = None
         else:
             try:
+                # Deferred: the SDK import costs noticeable module-load
+                # time and is only needed once a key is configured
+                import google.generativeai as genai
+
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel('gemini-pro')
                 self.gemini_available = True
@@ -105,10 +113,10 @@ class GeminiEmbeddingExtractor:
             content = content.strip()
             
             # Find JSON array in response
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
+            json_match = _JSON_ARRAY_RE.search(content)
             if json_match:
                 json_text = json_match.group(0)
-                events = json.loads(json_text)
+                events = orjson.loads(json_text)
                 
                 # Validate and clean events
                 cleaned_events = []
@@ -3,7 +3,6 @@ GPT Extractor Module for SoF Event Extractor
 Handles event extraction using OpenAI's GPT API
 """
 
-import openai
 import os
 import json
 import logging
@@ -17,6 +16,9 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Compiled once - response parsing runs per extraction call
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
 class GPTExtractor:
     """GPT-based maritime event extraction utility"""
     
@@ -27,6 +29,10 @@ class GPTExtractor:
             self.client = None
         else:
             try:
+                # Deferred: the SDK import costs noticeable module-load
+                # time and is only needed once a key is configured
+                import openai
+
                 openai.api_key = self.api_key
                 self.client = openai.OpenAI(api_key=self.api_key)
                 logger.info("OpenAI client initialized successfully")
@@ -52,18 +58,26 @@ class GPTExtractor:
             # Create prompt for maritime event extraction
             prompt = self._create_extraction_prompt(text)
             
+            # Stream the completion so tokens are consumed as they arrive
+            # instead of blocking until the full ~1500-token response lands
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an expert maritime analyst specializing in extracting events from Statement of Facts documents."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=1500,
-                temperature=0.1
+                temperature=0.1,
+                stream=True
             )
-            
+
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+            content = "".join(parts)
+
             # Parse the response
-            content = response.choices[0].message.content
             events = self._parse_gpt_response(content)
             
             logger.info(f"GPT extracted {len(events)} events")
@@ -101,7 +115,7 @@ class GPTExtractor:
         """Parse GPT response and extract events"""
         try:
             # Try to find JSON in the response
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
+            json_match = _JSON_ARRAY_RE.search(content)
             if json_match:
                 json_text = json_match.group(0)
                 events = json.loads(json_text)
@@ -0,0 +1,115 @@
+"""
+SQLite-backed job storage for document processing jobs
+Replaces the unbounded in-memory jobs dict with an indexed, persistent store
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cachetools import TTLCache
+
+# Database file (SQLite keeps job state across reloads without an extra server)
+DB_FILE = Path("jobs_db.sqlite3")
+
+# Completed jobs are evicted after a day so the store doesn't grow unbounded
+JOB_TTL_SECONDS = 86400
+
+class JobStore:
+    """Persistent job store with an index on the owning user
+
+    Lookups by job_id hit the primary key, and per-user listings use the
+    user index instead of scanning every job. A small TTL cache in front
+    keeps hot status polls off the database entirely.
+    """
+
+    def __init__(self, db_file: Path = DB_FILE):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, "
+            "user TEXT NOT NULL, "
+            "updated_at REAL NOT NULL DEFAULT 0, "
+            "data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs (user)")
+        self._conn.commit()
+        # Hot-read cache for status polling (seconds of staleness is fine)
+        self._cache = TTLCache(maxsize=1024, ttl=5)
+
+    def set_job(self, job_id: str, job: Dict):
+        """Create or replace a job record"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, user, updated_at, data) VALUES (?, ?, ?, ?)",
+                (job_id, job.get("user", ""), now, json.dumps(job, default=str))
+            )
+            # TTL eviction: drop jobs that haven't been touched in a day
+            self._conn.execute(
+                "DELETE FROM jobs WHERE updated_at < ?", (now - JOB_TTL_SECONDS,)
+            )
+            self._conn.commit()
+            self._cache[job_id] = job
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a job by id, or None if it doesn't exist"""
+        cached = self._cache.get(job_id)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = json.loads(row[0])
+        self._cache[job_id] = job
+        return job
+
+    def update_job(self, job_id: str, updates: Dict):
+        """Merge updates into an existing job record"""
+        job = self.get_job(job_id)
+        if job is None:
+            return
+        job.update(updates)
+        self.set_job(job_id, job)
+
+    def list_jobs_for_user(self, user: str) -> List[Dict]:
+        """List all jobs owned by a user (indexed lookup, no full scan)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE user = ?", (user,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def list_job_summaries_for_user(self, user: str) -> List[Dict]:
+        """List id/status/filename/created_at for a user's jobs
+
+        Projects the listing fields with json_extract inside SQLite, so
+        completed jobs' event payloads are never deserialized just to
+        render the jobs list.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, "
+                "json_extract(data, '$.status'), "
+                "json_extract(data, '$.filename'), "
+                "json_extract(data, '$.created_at') "
+                "FROM jobs WHERE user = ?",
+                (user,)
+            ).fetchall()
+        return [
+            {"job_id": row[0], "status": row[1], "filename": row[2], "created_at": row[3]}
+            for row in rows
+        ]
+
+# Global job store instance
+job_store = JobStore()
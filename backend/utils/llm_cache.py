@@ -0,0 +1,83 @@
+"""
+Persistent cache for LLM extraction responses
+Re-uploading the same document skips the multi-second Gemini round-trip
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+from cachetools import LRUCache
+
+# Database file (shared across workers; SQLite handles the locking)
+DB_FILE = Path("llm_cache.sqlite3")
+
+# Bump when a prompt changes so stale responses don't get replayed
+PROMPT_VERSION = "v1"
+
+class SqliteLLMCache:
+    """Content-hash cache of parsed LLM responses
+
+    Keys are SHA-256 of (model, prompt version, text), so identical
+    document text always maps to the same entry regardless of filename.
+    A small in-process LRU sits in front of SQLite for hot repeats.
+    """
+
+    def __init__(self, db_file: Path = DB_FILE):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, "
+            "events_json TEXT NOT NULL, "
+            "ts REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._hot = LRUCache(maxsize=256)
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Derive the cache key for a (model, document text) pair
+
+        The text is whitespace-collapsed and case-folded first, so
+        re-uploads that differ only in OCR whitespace/line-break noise
+        or letter case still hit the same entry.
+        """
+        normalized = " ".join(text.split()).lower()
+        digest_input = f"{model}|{PROMPT_VERSION}|{normalized}"
+        return hashlib.sha256(digest_input.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached parsed response, or None on a miss"""
+        cached = self._hot.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT events_json FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        value = orjson.loads(row[0])
+        self._hot[key] = value
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a parsed response under its content hash"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, events_json, ts) VALUES (?, ?, ?)",
+                (key, orjson.dumps(value, default=str).decode("utf-8"), time.time())
+            )
+            self._conn.commit()
+            self._hot[key] = value
+
+# Global cache instance
+llm_cache = SqliteLLMCache()
@@ -1,6 +1,7 @@
 import os
 import io
 import json
+import orjson
 import time
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
@@ -10,7 +11,6 @@ from datetime import datetime
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 
 # Local modules
 from sof_pipeline import (
@@ -90,8 +90,9 @@ def render_add_event_form():
         event_description = st.text_input("Event*")
         
         c1, c2 = st.columns(2)
-        start_date = c1.date_input("Start Date*", datetime.now().date())
-        start_time = c2.time_input("Start Time*", datetime.now().time())
+        now = datetime.now()
+        start_date = c1.date_input("Start Date*", now.date())
+        start_time = c2.time_input("Start Time*", now.time())
         
         c3, c4 = st.columns(2)
         end_date = c3.date_input("End Date")
@@ -114,6 +115,20 @@ def render_add_event_form():
             new_df = pd.DataFrame([new_event])
             st.session_state.events_df = pd.concat([st.session_state.events_df, new_df], ignore_index=True)
 
+@st.cache_data(show_spinner=False)
+def _df_to_csv(df_hash: str, _df: pd.DataFrame) -> str:
+    """Serialize events for the CSV download button (cached per frame)."""
+    return _df.to_csv(index=False, date_format='%Y-%m-%d %H:%M:%S')
+
+@st.cache_data(show_spinner=False)
+def _df_to_json(df_hash: str, _df: pd.DataFrame) -> bytes:
+    """Serialize events for the JSON download button (cached per frame)."""
+    return orjson.dumps(
+        _df.to_dict(orient='records'),
+        option=orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    )
+
 def render_results(results: LaytimeResult):
     """Renders the calculation results."""
     st.subheader("Laytime Calculation Results")
@@ -153,11 +168,13 @@ def render_results(results: LaytimeResult):
         }
     )
 
-    # Add download buttons
+    # Add download buttons. Serialization runs on every rerun otherwise,
+    # so both payloads are cached against a hash of the frame
+    df_hash = str(pd.util.hash_pandas_object(results.events_df.astype(str)).sum())
     col1, col2 = st.columns(2)
     with col1:
         # Convert dataframe to CSV, ensuring datetime format is preserved
-        csv_data = results.events_df.to_csv(index=False, date_format='%Y-%m-%d %H:%M:%S')
+        csv_data = _df_to_csv(df_hash, results.events_df)
         st.download_button(
             label="Download as CSV",
             data=csv_data,
@@ -166,8 +183,9 @@ def render_results(results: LaytimeResult):
             use_container_width=True
         )
     with col2:
-        # Convert dataframe to JSON
-        json_data = results.events_df.to_json(orient="records", date_format="iso")
+        # Convert dataframe to JSON - orjson serialises records (and
+        # their timestamps) natively instead of pandas' object round-trip
+        json_data = _df_to_json(df_hash, results.events_df)
         st.download_button(
             label="Download as JSON",
             data=json_data,
@@ -180,6 +198,18 @@ def render_results(results: LaytimeResult):
         for entry in results.calculation_log:
             st.text(entry)
 
+@st.cache_data(show_spinner=False)
+def _extract_cached(doc_hash: str, _docs, api_key: str):
+    """Memoized extraction keyed on the uploaded bytes.
+
+    doc_hash (plus the API key) is the cache key; _docs is excluded from
+    hashing by Streamlit's underscore convention. Pressing Extract again
+    on unchanged uploads returns the previous result without touching
+    OCR or Gemini.
+    """
+    return extract_events_and_summary(_docs, api_key)
+
+
 # --- Main App Logic ---
 st.title("Laytime Calculator – SoF Intelligence")
 
@@ -236,9 +266,12 @@ with st.expander("Upload & Extract Data", expanded=not st.session_state.get('sum
                     
                     else:
                         # Use regular processing ONLY when clicked PDF is NOT selected
+                        doc_hash = hashlib.sha256(
+                            b"".join(f.getvalue() for f in uploaded_files)
+                        ).hexdigest()
                         docs = process_uploaded_files(uploaded_files)
                         if docs:
-                            events_df, summary = extract_events_and_summary(docs, os.getenv("GOOGLE_API_KEY", ""))
+                            events_df, summary = _extract_cached(doc_hash, docs, os.getenv("GOOGLE_API_KEY", ""))
                             st.session_state.events_df = events_df
                             st.session_state.summary_data = summary
                             st.session_state.results = None # Reset results on new data
@@ -264,10 +297,13 @@ if st.session_state.get('summary_data'):
 
     st.header("Statement of Facts Timeline")
     
-    # Ensure datetime columns are of the correct type before rendering the editor
+    # Ensure datetime columns are of the correct type before rendering the
+    # editor. This block runs on every Streamlit rerun, so skip columns
+    # that are already datetime64 - after the first pass the conversion
+    # is a no-op dtype check instead of a per-row string parse.
     if not st.session_state.events_df.empty:
         for col in ['start_time_iso', 'end_time_iso']:
-            if col in st.session_state.events_df.columns:
+            if col in st.session_state.events_df.columns and not pd.api.types.is_datetime64_any_dtype(st.session_state.events_df[col]):
                 st.session_state.events_df[col] = pd.to_datetime(st.session_state.events_df[col], errors='coerce')
 
     st.session_state.events_df = st.data_editor(
@@ -1,9 +1,9 @@
 """
 PDF Parser Module for SoF Event Extractor
-Handles PDF text extraction using PyPDF2
+Handles PDF text extraction using PyMuPDF
 """
 
-import PyPDF2
+import fitz  # PyMuPDF
 from pathlib import Path
 import logging
 
@@ -11,40 +11,41 @@ logger = logging.getLogger(__name__)
 
 class PDFParser:
     """PDF text extraction utility"""
-    
+
     def __init__(self):
         self.supported_extensions = ['.pdf']
-    
+
     def extract_text(self, file_path: Path) -> str:
         """
         Extract text from PDF file
-        
+
         Args:
             file_path: Path to PDF file
-            
+
         Returns:
             str: Extracted text content
         """
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text += page.extract_text() + "\n"
-            
-            if not text.strip():
+            # PyMuPDF parses in C (and releases the GIL while doing so);
+            # collect per-page text and join once
+            doc = fitz.open(file_path)
+            try:
+                parts = [page.get_text("text") for page in doc]
+            finally:
+                doc.close()
+
+            text = "\n".join(parts).strip()
+            if not text:
                 logger.warning(f"No text extracted from PDF: {file_path}")
                 return ""
-            
+
             logger.info(f"Successfully extracted {len(text)} characters from PDF")
-            return text.strip()
-            
+            return text
+
         except Exception as e:
             logger.error(f"Error extracting text from PDF {file_path}: {e}")
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
-    
+
     def is_supported(self, file_path: Path) -> bool:
         """Check if file extension is supported"""
         return file_path.suffix.lower() in self.supported_extensions
@@ -2,15 +2,20 @@
 User models and database operations
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, EmailStr
+from cachetools import TTLCache
 import json
-import os
+import sqlite3
+import threading
 from pathlib import Path
 
-# Database file (using JSON for simplicity - use proper database in production)
-DB_FILE = Path("users_db.json")
+# Database file (shared across workers; SQLite handles the locking)
+DB_FILE = Path("users_db.sqlite3")
+
+# Old JSON store; imported into SQLite once if present
+LEGACY_JSON_FILE = Path("users_db.json")
 
 class User(BaseModel):
     """User model"""
@@ -52,110 +57,180 @@ class Token(BaseModel):
     user: UserResponse
 
 class UserDatabase:
-    """Simple JSON-based user database (use proper database in production)"""
-    
-    def __init__(self):
-        self.db_file = DB_FILE
-        self._ensure_db_exists()
-    
-    def _ensure_db_exists(self):
-        """Create database file if it doesn't exist"""
-        if not self.db_file.exists():
-            self._save_data({"users": [], "next_id": 1})
-    
-    def _load_data(self) -> Dict:
-        """Load data from JSON file"""
-        try:
-            with open(self.db_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"users": [], "next_id": 1}
-    
-    def _save_data(self, data: Dict):
-        """Save data to JSON file"""
-        with open(self.db_file, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-    
+    """SQLite-backed user store
+
+    Username/email lookups hit the UNIQUE B-tree indexes instead of
+    re-reading and scanning a JSON file, and writes update single rows
+    in place rather than rewriting the whole store.
+    """
+
+    def __init__(self, db_file: Path = DB_FILE):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # WAL lets reads proceed alongside a write; NORMAL sync is
+        # plenty for login bookkeeping
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "id INTEGER PRIMARY KEY, "
+            "username TEXT UNIQUE NOT NULL, "
+            "email TEXT UNIQUE NOT NULL, "
+            "full_name TEXT NOT NULL, "
+            "hashed_password TEXT NOT NULL, "
+            "is_active INTEGER NOT NULL DEFAULT 1, "
+            "created_at TEXT NOT NULL, "
+            "last_login TEXT)"
+        )
+        self._conn.commit()
+        self._migrate_legacy_json()
+        # get_current_user resolves a username on every authenticated
+        # request; a short TTL cache keeps those hot lookups off the db
+        self._user_cache = TTLCache(maxsize=1024, ttl=60)
+
+    def _migrate_legacy_json(self):
+        """One-time import from the old users_db.json store, if present."""
+        if not LEGACY_JSON_FILE.exists():
+            return
+        with self._lock:
+            if self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]:
+                return
+            try:
+                with open(LEGACY_JSON_FILE, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return
+            for user_data in data.get("users", []):
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO users "
+                    "(id, username, email, full_name, hashed_password, is_active, created_at, last_login) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        user_data.get("id"),
+                        user_data.get("username"),
+                        user_data.get("email"),
+                        user_data.get("full_name"),
+                        user_data.get("hashed_password"),
+                        int(bool(user_data.get("is_active", True))),
+                        user_data.get("created_at"),
+                        user_data.get("last_login"),
+                    )
+                )
+            self._conn.commit()
+
+    @staticmethod
+    def _row_to_user(row: sqlite3.Row) -> User:
+        return User(
+            id=row["id"],
+            username=row["username"],
+            email=row["email"],
+            full_name=row["full_name"],
+            hashed_password=row["hashed_password"],
+            is_active=bool(row["is_active"]),
+            created_at=datetime.fromisoformat(row["created_at"]),
+            last_login=datetime.fromisoformat(row["last_login"]) if row["last_login"] else None
+        )
+
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
-        data = self._load_data()
-        for user_data in data["users"]:
-            if user_data["username"] == username:
-                user_data["created_at"] = datetime.fromisoformat(user_data["created_at"])
-                if user_data.get("last_login"):
-                    user_data["last_login"] = datetime.fromisoformat(user_data["last_login"])
-                return User(**user_data)
-        return None
-    
+        cached = self._user_cache.get(username)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        user = self._row_to_user(row)
+        self._user_cache[username] = user
+        return user
+
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        data = self._load_data()
-        for user_data in data["users"]:
-            if user_data["email"] == email:
-                user_data["created_at"] = datetime.fromisoformat(user_data["created_at"])
-                if user_data.get("last_login"):
-                    user_data["last_login"] = datetime.fromisoformat(user_data["last_login"])
-                return User(**user_data)
-        return None
-    
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM users WHERE email = ?", (email,)
+            ).fetchone()
+        return self._row_to_user(row) if row else None
+
     def create_user(self, user_create: UserCreate, hashed_password: str) -> User:
         """Create a new user"""
-        data = self._load_data()
-        
-        # Check if username or email already exists
-        if self.get_user_by_username(user_create.username):
+        created_at = datetime.utcnow()
+        # The UNIQUE indexes enforce name/email uniqueness inside the
+        # insert itself - one statement instead of two pre-check SELECTs,
+        # with no window for a concurrent insert to slip through
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "INSERT INTO users "
+                    "(username, email, full_name, hashed_password, is_active, created_at) "
+                    "VALUES (?, ?, ?, ?, 1, ?)",
+                    (
+                        user_create.username,
+                        user_create.email,
+                        user_create.full_name,
+                        hashed_password,
+                        created_at.isoformat(),
+                    )
+                )
+                self._conn.commit()
+                user_id = cursor.lastrowid
+        except sqlite3.IntegrityError as e:
+            if "users.email" in str(e):
+                raise ValueError("Email already exists")
             raise ValueError("Username already exists")
-        
-        if self.get_user_by_email(user_create.email):
-            raise ValueError("Email already exists")
-        
-        # Create new user
-        user_id = data["next_id"]
-        new_user = User(
+        self._user_cache.pop(user_create.username, None)
+
+        return User(
             id=user_id,
             username=user_create.username,
             email=user_create.email,
             full_name=user_create.full_name,
             hashed_password=hashed_password,
-            created_at=datetime.utcnow()
+            created_at=created_at
         )
-        
-        # Add to database
-        data["users"].append(new_user.dict())
-        data["next_id"] += 1
-        self._save_data(data)
-        
-        return new_user
-    
-    def update_last_login(self, username: str):
-        """Update user's last login time"""
-        data = self._load_data()
-        for user_data in data["users"]:
-            if user_data["username"] == username:
-                user_data["last_login"] = datetime.utcnow().isoformat()
-                self._save_data(data)
-                break
-    
+
+    def update_last_login(self, username: str) -> Optional[datetime]:
+        """Update user's last login time and return the new timestamp"""
+        now = datetime.utcnow()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE users SET last_login = ? WHERE username = ?",
+                (now.isoformat(), username)
+            )
+            self._conn.commit()
+        if cursor.rowcount == 0:
+            return None
+        # Refresh rather than evict: the same user's next authenticated
+        # request would otherwise re-query for a row we can update here
+        cached = self._user_cache.get(username)
+        if cached is not None:
+            self._user_cache[username] = cached.copy(update={"last_login": now})
+        return now
+
     def get_all_users(self) -> List[UserResponse]:
         """Get all users (admin function)"""
-        data = self._load_data()
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM users ORDER BY id").fetchall()
+
         users = []
-        for user_data in data["users"]:
-            user_data["created_at"] = datetime.fromisoformat(user_data["created_at"])
-            if user_data.get("last_login"):
-                user_data["last_login"] = datetime.fromisoformat(user_data["last_login"])
-            
+        for row in rows:
+            user = self._row_to_user(row)
             # Remove password from response
-            user_response = UserResponse(
-                id=user_data["id"],
-                username=user_data["username"],
-                email=user_data["email"],
-                full_name=user_data["full_name"],
-                is_active=user_data["is_active"],
-                created_at=user_data["created_at"],
-                last_login=user_data.get("last_login")
-            )
-            users.append(user_response)
+            users.append(UserResponse(
+                id=user.id,
+                username=user.username,
+                email=user.email,
+                full_name=user.full_name,
+                is_active=user.is_active,
+                created_at=user.created_at,
+                last_login=user.last_login
+            ))
         return users
 
 # Global database instance